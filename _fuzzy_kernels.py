@@ -0,0 +1,80 @@
+# ================== _fuzzy_kernels.py ==================
+"""Numeric kernels behind fuzzy.py.
+
+With Numba installed the loops below are JIT-compiled; without it each
+kernel falls back to an equivalent NumPy expression.
+"""
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # numba is optional; NumPy fallbacks are used without it
+    numba = None
+
+_MF_SIGNATURES = ['float32(float32, float32, float32, float32, float32)',
+                  'float64(float64, float64, float64, float64, float64)']
+
+# Membership functions over the open support (lo, hi): zero outside it, the
+# smaller leg inside it. Legs take precomputed reciprocal slopes so the
+# kernels only multiply; an inverse of 0 marks a vertical leg, which never
+# wins the minimum and is replaced by 1.
+
+def _leg(run, inv):
+    return run * inv if inv != 0 else 1.0
+
+def _tri_scalar(x, lo, hi, inv_rise, inv_fall):
+    return min(_leg(x - lo, inv_rise), _leg(hi - x, inv_fall)) if lo < x < hi else 0.0
+
+def _trap_scalar(x, lo, hi, inv_rise, inv_fall):
+    return min(1.0, _leg(x - lo, inv_rise), _leg(hi - x, inv_fall)) if lo < x < hi else 0.0
+
+def _tri_numpy(x: np.ndarray, lo: float, hi: float, inv_rise: float, inv_fall: float) -> np.ndarray:
+    # Both legs exceed 1 on a trapezoid's flat top, so clip produces the plateau
+    rise = (x - lo) * inv_rise if inv_rise else np.inf
+    fall = (hi - x) * inv_fall if inv_fall else np.inf
+    return np.clip(np.minimum(rise, fall), 0.0, 1.0) * ((x > lo) & (x < hi))
+
+# Mamdani aggregation and centroid
+
+def aggregate(degrees: np.ndarray, cons_matrix: np.ndarray) -> np.ndarray:
+    # Clip and accumulate rule by rule into one buffer instead of building
+    # an (n_rules, n_y) temporary. degrees is (n_rules,) or (n_rules, B);
+    # the result is (n_y,) or (B, n_y) accordingly.
+    aggregated = np.zeros(degrees.shape[1:] + cons_matrix.shape[1:], dtype=cons_matrix.dtype)
+    clipped = np.empty_like(aggregated)
+    for degree, row in zip(degrees[..., None], cons_matrix):
+        np.minimum(degree, row, out=clipped)
+        np.maximum(aggregated, clipped, out=aggregated)
+    return aggregated
+
+def _infer_defuzz_numpy(degrees: np.ndarray, cons_matrix: np.ndarray,
+                        wy: np.ndarray, w: np.ndarray) -> float:
+    aggregated = aggregate(degrees, cons_matrix)
+    den = np.dot(w, aggregated)
+    return float(np.dot(wy, aggregated) / den) if den != 0 else 0.0
+
+def _infer_defuzz_fused(degrees: np.ndarray, cons_matrix: np.ndarray,
+                        wy: np.ndarray, w: np.ndarray) -> float:
+    # Single pass over the output range: aggregate and accumulate the centroid
+    num = 0.0
+    den = 0.0
+    for i in range(w.shape[0]):
+        agg = 0.0
+        for r in range(degrees.shape[0]):
+            v = min(degrees[r], cons_matrix[r, i])
+            if v > agg:
+                agg = v
+        num += wy[i] * agg
+        den += w[i] * agg
+    return num / den if den != 0.0 else 0.0
+
+if numba is not None:
+    _leg = numba.njit(inline='always', fastmath=True)(_leg)
+    # Element-wise ufuncs let LLVM vectorize across SIMD lanes; 'cpu' rather
+    # than 'parallel' since universes are far too small to amortize threads
+    tri = numba.vectorize(_MF_SIGNATURES, target='cpu', fastmath=True, cache=True)(_tri_scalar)
+    trap = numba.vectorize(_MF_SIGNATURES, target='cpu', fastmath=True, cache=True)(_trap_scalar)
+    infer_defuzz = numba.njit(cache=True, fastmath=True)(_infer_defuzz_fused)
+else:
+    tri = trap = _tri_numpy
+    infer_defuzz = _infer_defuzz_numpy
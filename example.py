@@ -34,11 +34,13 @@ fuzzy_project/
 ```
 """
 # ================== examples.py ==================
+import numpy as np
+
 from fuzzy import FuzzySet, FuzzyInferenceSystem, FuzzyRule, triangular
 
 if __name__ == "__main__":
     # Universe
-    x_universe = [i for i in range(0, 101)]  # e.g., speed 0-100
+    x_universe = np.arange(0, 101, dtype=np.float64)  # e.g., speed 0-100
 
     # Define fuzzy sets: slow, medium, fast
     slow = FuzzySet(triangular(0, 0, 50), x_universe)
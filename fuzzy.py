@@ -1,100 +1,521 @@
 # ================== fuzzy_logic.py ==================
+import functools
 from typing import Callable, Dict, List, Tuple
 
+import numpy as np
+
+from _fuzzy_kernels import aggregate as _aggregate, infer_defuzz as _infer_defuzz
+from _fuzzy_kernels import tri as _tri, trap as _trap
+
+# Integer membership arrays hold Q15 fixed point: degree 1.0 is stored as 32767
+Q15_SCALE = 32767
+
 class MembershipFunction:
-    """Defines a fuzzy membership function over a domain."""
-    def __init__(self, func: Callable[[float], float], name: str = None):
+    """Defines a fuzzy membership function over a domain.
+
+    ``func`` evaluates a single crisp value; ``vectorized`` optionally
+    evaluates a whole array at once and is used when sampling a universe.
+    Both must already return degrees in [0, 1]; wrap arbitrary functions
+    with ``MembershipFunction.safe`` to have them clamped. ``knots`` lists the
+    breakpoints of piecewise-linear functions (None when unknown).
+    """
+    def __init__(self,
+                 func: Callable[[float], float],
+                 name: str = None,
+                 vectorized: Callable[[np.ndarray], np.ndarray] = None,
+                 knots: Tuple[float, ...] = None):
         self.func = func
         self.name = name or func.__name__
+        self._vectorized = vectorized
+        self.knots = knots
 
     def __call__(self, x: float) -> float:
-        return max(0.0, min(1.0, self.func(x)))
+        if isinstance(x, np.ndarray):
+            return self.vectorized(x)
+        return self.func(x)
+
+    def vectorized(self, x: np.ndarray) -> np.ndarray:
+        if self._vectorized is None:
+            # No array form supplied: fall back to the scalar function
+            return np.fromiter((self.func(v) for v in x), dtype=np.float64, count=len(x))
+        return self._vectorized(x)
+
+    @classmethod
+    def safe(cls,
+             func: Callable[[float], float],
+             name: str = None,
+             vectorized: Callable[[np.ndarray], np.ndarray] = None) -> 'MembershipFunction':
+        """Build a membership function whose outputs are clamped to [0, 1]."""
+        clamped = lambda x: max(0.0, min(1.0, func(x)))
+        clamped_vec = None if vectorized is None else lambda x: np.clip(vectorized(x), 0.0, 1.0)
+        return cls(clamped, name=name or func.__name__, vectorized=clamped_vec)
 
 class FuzzySet:
-    """A fuzzy set defined by a membership function over a universe."""
+    """A fuzzy set defined by a membership function over a universe.
+
+    ``mu_values`` is stored as ``dtype``: float32 by default, or an integer
+    type such as np.int16 for Q15 fixed point. Scalar ``mu`` queries always
+    return floats.
+    """
     def __init__(self,
                  mu: MembershipFunction,
-                 universe: List[float]):
-        self.mu = mu
-        self.universe = universe
-        self.members: Dict[float, float] = {x: mu(x) for x in universe}
+                 universe: np.ndarray,
+                 dtype: np.dtype = np.float32):
+        self.universe = np.asarray(universe, dtype=np.float64)
+        self._ascending = bool(np.all(np.diff(self.universe) >= 0))
+        # Scalar queries are memoized; crisp inputs tend to recur in control loops
+        scalar = functools.lru_cache(maxsize=4096)(mu.func)
+        if _is_integer_range(self.universe):
+            # One float64 evaluation feeds both the lookup table, which serves
+            # float64 degrees whatever the storage dtype, and the stored values
+            values = mu.vectorized(self.universe)
+            scalar = self._lookup_table(values, scalar)
+        else:
+            values = _evaluate(mu, self.universe, dtype)
+        # Membership degrees sampled over the universe, aligned with self.universe
+        self.mu_values: np.ndarray = _as_dtype(values, dtype)
+        self.mu = MembershipFunction(scalar, name=mu.name, vectorized=mu.vectorized, knots=mu.knots)
+
+    def _lookup_table(self, values: np.ndarray, fallback: Callable[[float], float]) -> Callable[[float], float]:
+        # Dense integer universe: scalar queries on the grid become one list
+        # index into the sampled values, anything else goes to ``fallback``
+        self._lut = values.tolist()
+        self._lo = int(self.universe[0])
+
+        def lookup(x: float, _l=self._lut, _o=self._lo, _n=len(self._lut), _f=fallback) -> float:
+            # Range check first: it is False for NaN and inf, which int() rejects
+            if _o <= x < _o + _n:
+                i = int(x) - _o
+                if i + _o == x:
+                    return _l[i]
+            return _f(x)
+        return lookup
+
+    @functools.cached_property
+    def members(self) -> Dict[float, float]:
+        # Built on first access only; mu_values never changes after construction
+        return dict(zip(self.universe.tolist(), _as_degrees(self.mu_values).tolist()))
+
+    def __getitem__(self, x: float) -> float:
+        # Stored degree at universe point x; KeyError off the grid, like
+        # members[x]. Binary search when the universe is ascending, a linear
+        # scan otherwise.
+        if self._ascending:
+            i = int(np.searchsorted(self.universe, x))
+            found = i < self.universe.size and self.universe[i] == x
+        else:
+            hits = np.flatnonzero(self.universe == x)
+            found = hits.size > 0
+            i = int(hits[-1]) if found else 0
+        if found:
+            return float(_as_degrees(self.mu_values[i:i + 1])[0])
+        raise KeyError(x)
 
     def complement(self) -> 'FuzzySet':
         return FuzzySet(
-            MembershipFunction(lambda x: 1 - self.mu(x), name=f"not_{self.mu.name}"),
-            self.universe)
+            MembershipFunction(lambda x: 1 - self.mu(x), name=f"not_{self.mu.name}",
+                               vectorized=lambda x: 1 - self.mu.vectorized(x)),
+            self.universe, self.mu_values.dtype)
 
     @staticmethod
     def intersection(A: 'FuzzySet', B: 'FuzzySet') -> 'FuzzySet':
         return FuzzySet(
-            MembershipFunction(lambda x: min(A.mu(x), B.mu(x)), name=f"({A.mu.name}_and_{B.mu.name})"),
-            A.universe)
+            MembershipFunction(lambda x: min(A.mu(x), B.mu(x)), name=f"({A.mu.name}_and_{B.mu.name})",
+                               vectorized=lambda x: np.minimum(A.mu.vectorized(x), B.mu.vectorized(x))),
+            A.universe, A.mu_values.dtype)
 
     @staticmethod
     def union(A: 'FuzzySet', B: 'FuzzySet') -> 'FuzzySet':
         return FuzzySet(
-            MembershipFunction(lambda x: max(A.mu(x), B.mu(x)), name=f"({A.mu.name}_or_{B.mu.name})"),
-            A.universe)
+            MembershipFunction(lambda x: max(A.mu(x), B.mu(x)), name=f"({A.mu.name}_or_{B.mu.name})",
+                               vectorized=lambda x: np.maximum(A.mu.vectorized(x), B.mu.vectorized(x))),
+            A.universe, A.mu_values.dtype)
+
+def _sample(mu: MembershipFunction, points: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """Evaluate ``mu`` over ``points`` and store the degrees as ``dtype``."""
+    return _as_dtype(_evaluate(mu, points, dtype), dtype)
+
+def _evaluate(mu: MembershipFunction, points: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """Evaluate ``mu`` over ``points`` for storage as ``dtype``."""
+    # float32 storage runs the kernels' float32 loops, but only when the points
+    # and knots survive the cast; otherwise rounding would move the samples
+    if np.dtype(dtype) == np.float32 and _float32_exact(points, *(mu.knots or ())):
+        points = points.astype(np.float32)
+    return mu.vectorized(points)
+
+def _float32_exact(points: np.ndarray, *knots: float) -> bool:
+    """True if ``points`` and ``knots`` are all exactly representable in float32."""
+    values = np.append(points, knots)
+    return bool(np.all(values.astype(np.float32) == values))
+
+def _as_dtype(values: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """Store float degrees as ``dtype``, scaling to Q15 for integer types."""
+    dtype = np.dtype(dtype)
+    if dtype.kind in 'iu':
+        if np.iinfo(dtype).max < Q15_SCALE:
+            raise ValueError(f"{dtype} cannot hold Q15 degrees; use np.int16 or wider")
+        return np.round(values * Q15_SCALE).astype(dtype)
+    return values.astype(dtype, copy=False)
+
+def _as_degrees(values: np.ndarray) -> np.ndarray:
+    """Inverse of _as_dtype: float64 degrees in [0, 1]."""
+    if values.dtype.kind in 'iu':
+        return values / Q15_SCALE
+    return values.astype(np.float64, copy=False)
+
+def _is_integer_range(universe: np.ndarray) -> bool:
+    """True for universes like range(lo, hi): consecutive integers, step 1."""
+    return (universe.size > 0
+            and bool(np.all(universe == np.round(universe)))
+            and bool(np.all(np.diff(universe) == 1)))
 
 # Mamdani inference rule
 class FuzzyRule:
     def __init__(self,
                  antecedent: Callable[[Dict[str, float]], float],
                  consequent: FuzzySet):
-        self.antecedent = antecedent
+        # Antecedents are pure functions of the crisp inputs, so degrees are
+        # memoized per distinct input assignment, bounded like FuzzySet.mu
+        self._raw = antecedent
+        self._cache = functools.lru_cache(maxsize=4096)(lambda key: antecedent(dict(key)))
+
+        def cached(inputs: Dict[str, float], _c=self._cache, _f=antecedent) -> float:
+            key = tuple(sorted(inputs.items()))
+            try:
+                hash(key)
+            except TypeError:
+                # Unhashable values (lists, arrays) cannot key the cache
+                return _f(inputs)
+            return _c(key)
+
+        self.antecedent = cached
         self.consequent = consequent
 
+    @classmethod
+    def from_single(cls, var: str, fuzzy_set: FuzzySet, consequent: FuzzySet) -> 'FuzzyRule':
+        """IF <var> is <fuzzy_set> THEN <consequent>, read straight from the set."""
+        rule = cls.from_mf(var, fuzzy_set.mu, consequent)
+        # Scalar inference calls the set's own scalar path (the lookup table
+        # on integer universes), skipping MembershipFunction dispatch
+        rule.antecedent = lambda inputs, _f=fuzzy_set.mu.func: _f(inputs[var])
+        return rule
+
+    @classmethod
+    def from_mf(cls, var: str, mf: MembershipFunction, consequent: FuzzySet) -> 'FuzzyRule':
+        """IF <var> is <mf> THEN <consequent>; such rules can be compiled."""
+        direct = lambda inputs, _mu=mf: _mu(inputs[var])
+        rule = cls(direct, consequent)
+        # A single membership lookup is cheaper than building the cache key
+        rule.antecedent = direct
+        rule.variable = var
+        rule.mf = mf
+        return rule
+
+def _consequent_knots(rule: FuzzyRule) -> Tuple[float, ...]:
+    knots = rule.consequent.mu.knots
+    if knots is None:
+        raise ValueError(f"consequent {rule.consequent.mu.name} has no knots")
+    return knots
+
+def _vertical_edges(knots: Tuple[float, ...]) -> List[float]:
+    """Support edges of a triangular/trapezoidal MF whose leg is vertical."""
+    lo, hi = knots[0], knots[-1]
+    if lo == hi:
+        return []
+    edges = []
+    if knots[1] == lo:
+        edges.append(lo)
+    if knots[-2] == hi:
+        edges.append(hi)
+    return edges
+
 class FuzzyInferenceSystem:
     def __init__(self,
-                 universe: List[float],
-                 output_range: List[float]):
-        self.universe = universe
-        self.output_range = output_range
+                 universe: np.ndarray,
+                 output_range: np.ndarray):
+        self.universe = np.asarray(universe, dtype=np.float64)
         self.rules: List[FuzzyRule] = []
+        # Rule base kept as parallel arrays: antecedent r and consequent row r
+        # belong to rules[r]. The consequent matrix is stacked lazily.
+        self._antecedents: List[Callable[[Dict[str, float]], float]] = []
+        # Uncached antecedents, called with whole arrays by infer_batch
+        self._batch_antecedents: List[Callable[[Dict[str, np.ndarray]], np.ndarray]] = []
+        self._consequents: List[np.ndarray] = []
+        self._cons_matrix: np.ndarray = None
+        self._compiled: Callable[[Dict[str, float]], float] = None
+        # ((lo, hi), anchors) once set_sparse_output has been called
+        self._sparse: Tuple[Tuple[float, float], Tuple[float, ...]] = None
+        # (far, near) interior probe points per sparse grid point
+        self._probes: Tuple[np.ndarray, np.ndarray] = None
+        output_range = np.asarray(output_range, dtype=np.float64)
+        self._set_output_range(output_range, np.ones_like(output_range))
+
+    def _set_output_range(self, output_range: np.ndarray, weights: np.ndarray,
+                          weighted_y: np.ndarray = None):
+        # Centroid weights per output point: all ones on a dense grid (discrete
+        # centroid), exact integrals of the linear interpolant on a sparse one
+        self.output_range = np.asarray(output_range, dtype=np.float64)
+        self._weights = np.asarray(weights, dtype=np.float64)
+        if weighted_y is None:
+            weighted_y = self.output_range * self._weights
+        self._weighted_y = np.asarray(weighted_y, dtype=np.float64)
+
+    def _sample_consequent(self, consequent: FuzzySet) -> np.ndarray:
+        if self._probes is not None:
+            # Sparse grid: each point takes the consequent's limit from the
+            # side given by its probes. Consequents are linear between grid
+            # points, so extrapolating from two interior probes is exact.
+            far, near = self._probes
+            values = 2 * consequent.mu.vectorized(near) - consequent.mu.vectorized(far)
+            return _as_dtype(np.clip(values, 0.0, 1.0), consequent.mu_values.dtype)
+        if np.array_equal(consequent.universe, self.output_range):
+            return consequent.mu_values
+        return _sample(consequent.mu, self.output_range, consequent.mu_values.dtype)
 
     def add_rule(self, rule: FuzzyRule):
+        # Sample the consequent over the output range once per rule
+        fixed_point = rule.consequent.mu_values.dtype.kind in 'iu'
+        if self._consequents and (self._consequents[0].dtype.kind in 'iu') != fixed_point:
+            raise ValueError("cannot mix fixed-point and floating-point consequents")
+        if self._sparse is not None:
+            _consequent_knots(rule)
         self.rules.append(rule)
+        self._antecedents.append(rule.antecedent)
+        self._batch_antecedents.append(rule._raw)
+        self._consequents.append(self._sample_consequent(rule.consequent))
+        if self._sparse is not None:
+            # The new consequent's knots join the grid
+            self._resample_sparse()
+        self._invalidate()
+
+    def remove_rule(self, rule: FuzzyRule):
+        # Keep the parallel arrays aligned and drop the stacked matrix
+        i = self.rules.index(rule)
+        del self.rules[i], self._antecedents[i], self._batch_antecedents[i], self._consequents[i]
+        if self._sparse is not None:
+            self._resample_sparse()
+        self._invalidate()
 
-    def infer(self, inputs: Dict[str, float]) -> Dict[float, float]:
-        # Mamdani: aggregate clipped consequents
-        aggregated: Dict[float, float] = {y: 0.0 for y in self.output_range}
+    def set_sparse_output(self, anchors: List[float] = ()):
+        """Sample the output only at consequent knots plus ``anchors``.
+
+        Every consequent must expose ``knots`` (as triangular/trapezoidal do).
+        Points outside the original output range are dropped and its end
+        points are kept. The grid follows later add_rule/remove_rule calls.
+        A knot where some consequent has a vertical leg (a shoulder) appears
+        twice, holding the limits from the left and from the right, so
+        plateaus are integrated exactly. Clipped consequents bend where they
+        cross the firing degree, which is generally not a knot, so add anchors
+        where more resolution is needed.
+        """
+        if self._sparse is None:
+            bounds = (float(self.output_range[0]), float(self.output_range[-1]))
+        else:
+            bounds = self._sparse[0]
+        self._sparse = (bounds, tuple(anchors))
+        self._resample_sparse()
+        self._invalidate()
+
+    def _resample_sparse(self):
+        (lo, hi), anchors = self._sparse
+        points = [lo, hi, *anchors]
+        jumps = set()
         for rule in self.rules:
-            degree = rule.antecedent(inputs)
-            for y in self.output_range:
-                aggregated[y] = max(aggregated[y], min(degree, rule.consequent.mu(y)))
-        return aggregated
+            knots = _consequent_knots(rule)
+            points.extend(knots)
+            jumps.update(_vertical_edges(knots))
+        u = np.unique(np.asarray(points, dtype=np.float64))
+        u = u[(u >= lo) & (u <= hi)]
+        # Interior jumps are split into a left-limit and a right-limit sample;
+        # the end points take the limit from inside the range
+        y = np.repeat(u, [2 if lo < k < hi and k in jumps else 1 for k in u.tolist()])
+        side = np.zeros_like(y)
+        side[1:][y[1:] == y[:-1]] = 1
+        side[:-1][y[:-1] == y[1:]] = -1
+        if u.size > 1:
+            side[0], side[-1] = 1, -1
+        j = np.searchsorted(u, y)
+        step = np.zeros_like(y)
+        step[side < 0] = u[j[side < 0] - 1] - y[side < 0]
+        step[side > 0] = u[j[side > 0] + 1] - y[side > 0]
+        self._probes = (y + step / 2, y + step / 4)
+        # Integrals of mu and y * mu for mu linear on each interval: each point
+        # gets half of each adjacent interval's area, and its share of the
+        # moment. The two samples of a split point share a zero-width interval.
+        dy = np.diff(y)
+        weights = np.zeros_like(y)
+        weights[:-1] += dy / 2
+        weights[1:] += dy / 2
+        weighted_y = np.zeros_like(y)
+        weighted_y[:-1] += dy * (2 * y[:-1] + y[1:]) / 6
+        weighted_y[1:] += dy * (y[:-1] + 2 * y[1:]) / 6
+        self._set_output_range(y, weights, weighted_y)
+        self._consequents = [self._sample_consequent(rule.consequent) for rule in self.rules]
+
+    def _invalidate(self):
+        self._cons_matrix = None
+        self._compiled = None
+
+    def _consequent_matrix(self) -> np.ndarray:
+        if self._cons_matrix is None:
+            if self._consequents:
+                self._cons_matrix = np.vstack(self._consequents)
+            else:
+                self._cons_matrix = np.empty((0, self.output_range.size))
+        return self._cons_matrix
+
+    def _degrees(self, inputs: Dict[str, float], dtype: np.dtype) -> np.ndarray:
+        # Firing degrees in the consequents' dtype so min/max never upcast
+        antecedents = self._antecedents
+        degrees = np.fromiter((a(inputs) for a in antecedents), dtype=np.float64, count=len(antecedents))
+        return _as_dtype(degrees, dtype)
+
+    def infer(self, inputs: Dict[str, float]) -> np.ndarray:
+        # Mamdani: aggregate clipped consequents, aligned with self.output_range.
+        # The result has the consequents' dtype (Q15 integers in fixed-point mode).
+        cons = self._consequent_matrix()
+        return _aggregate(self._degrees(inputs, cons.dtype), cons)
+
+    def defuzzify(self, aggregated: np.ndarray) -> float:
+        # Centroid method; on sparse output, the exact centroid of the linear
+        # interpolant through the samples.
+        # Sums are taken in float64; the Q15 scale cancels in the ratio.
+        den = np.dot(self._weights, aggregated)
+        return float(np.dot(self._weighted_y, aggregated) / den) if den != 0 else 0.0
+
+    def infer_batch(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        """Aggregated output sets for B input vectors at once, shape (B, n_y).
+
+        Each input maps to an array of B crisp values. Antecedents are
+        called once with the whole arrays, so they must accept them, as
+        ``FuzzySet.mu`` does; rules from from_mf/from_single always do.
+        """
+        arrays = {k: np.asarray(v, dtype=np.float64) for k, v in inputs.items()}
+        shape = np.broadcast_shapes(*(v.shape for v in arrays.values()))
+        degrees = np.empty((len(self._batch_antecedents),) + shape)
+        for r, antecedent in enumerate(self._batch_antecedents):
+            degrees[r] = antecedent(arrays)
+        cons = self._consequent_matrix()
+        return _aggregate(_as_dtype(degrees, cons.dtype), cons)
 
-    def defuzzify(self, aggregated: Dict[float, float]) -> float:
-        # Centroid method
-        num = sum(y * mu for y, mu in aggregated.items())
-        den = sum(mu for mu in aggregated.values())
-        return num / den if den != 0 else 0.0
+    def defuzzify_batch(self, aggregated: np.ndarray) -> np.ndarray:
+        # Row-wise centroid of infer_batch's result; 0.0 where nothing fired
+        num = aggregated @ self._weighted_y
+        den = aggregated @ self._weights
+        return np.divide(num, den, out=np.zeros_like(num), where=den != 0)
+
+    def infer_defuzzify(self, inputs: Dict[str, float]) -> float:
+        """Crisp output for ``inputs``; same result as defuzzify(infer(inputs)).
+
+        Aggregation and centroid are fused, so the aggregated membership
+        array is never materialized when Numba is available.
+        """
+        cons = self._consequent_matrix()
+        return _infer_defuzz(self._degrees(inputs, cons.dtype), cons,
+                             self._weighted_y, self._weights)
+
+    def compile(self) -> Callable[[Dict[str, float]], float]:
+        """Specialize the current rule base into one generated function.
+
+        Every rule must come from FuzzyRule.from_mf/from_single with a
+        triangular or trapezoidal antecedent. Their knots are baked into the
+        generated source as constants; the result maps inputs to the same
+        crisp value as infer_defuzzify. It is cached until the rules or the
+        output range change.
+        """
+        if self._compiled is None:
+            self._compiled = _compile_rule_base(self.rules, self._consequent_matrix(),
+                                                self._weighted_y, self._weights)
+        return self._compiled
+
+def _mf_source(x: str, knots: Tuple[float, ...]) -> str:
+    """Closed-form source for a triangular/trapezoidal MF evaluated at ``x``."""
+    if len(knots) == 3:
+        a, b, c = knots
+        rise, fall, top = (a, b), (b, c), False
+    elif len(knots) == 4:
+        a, b, c, d = knots
+        rise, fall, top = (a, b), (c, d), True
+    else:
+        raise ValueError(f"cannot compile membership function with knots {knots}")
+    lo, hi = float(rise[0]), float(fall[1])
+    # Vertical legs are dropped; a flat top needs the explicit 1.0 cap
+    terms = ["1.0"] if top else []
+    if rise[1] != rise[0]:
+        terms.append(f"({x} - {lo!r}) * {_inverse(rise[1] - rise[0])!r}")
+    if fall[1] != fall[0]:
+        terms.append(f"({hi!r} - {x}) * {_inverse(fall[1] - fall[0])!r}")
+    if not terms:
+        terms = ["1.0"]
+    body = terms[0] if len(terms) == 1 else f"min({', '.join(terms)})"
+    return f"{body} if {lo!r} < {x} < {hi!r} else 0.0"
+
+def _compile_rule_base(rules: List[FuzzyRule], cons_matrix: np.ndarray,
+                       wy: np.ndarray, w: np.ndarray) -> Callable[[Dict[str, float]], float]:
+    variables: Dict[str, str] = {}
+    lines = ["def compiled(inputs):"]
+    degrees = []
+    for k, rule in enumerate(rules):
+        mf = getattr(rule, 'mf', None)
+        if mf is None or mf.knots is None:
+            raise ValueError("compile() needs rules built with FuzzyRule.from_mf or from_single "
+                             "over triangular/trapezoidal sets")
+        if rule.variable not in variables:
+            variables[rule.variable] = x = f"x{len(variables)}"
+            lines.append(f"    {x} = inputs[{rule.variable!r}]")
+        lines.append(f"    d{k} = {_mf_source(variables[rule.variable], mf.knots)}")
+        degrees.append(f"d{k}")
+    lines.append(f"    degrees = _as_dtype(np.array([{', '.join(degrees)}], dtype=np.float64), dtype)")
+    lines.append("    return _infer_defuzz(degrees, cons, wy, w)")
+    namespace = {'np': np, '_as_dtype': _as_dtype, '_infer_defuzz': _infer_defuzz,
+                 'dtype': cons_matrix.dtype, 'cons': cons_matrix, 'wy': wy, 'w': w}
+    exec("\n".join(lines), namespace)
+    return namespace['compiled']
 
 # Triangular and Trapezoidal MFs
 
+def _inverse(run: float) -> float:
+    # Reciprocal slope of a leg; 0.0 marks a vertical leg
+    return 1.0 / run if run != 0 else 0.0
+
+
 def triangular(a: float, b: float, c: float) -> MembershipFunction:
+    # Hoist the divisions: evaluation only multiplies by these
+    inv1 = _inverse(b - a)
+    inv2 = _inverse(c - b)
+
     def mu(x: float) -> float:
         if x <= a or x >= c:
             return 0.0
-        return (x - a) / (b - a) if x < b else (c - x) / (c - b)
-    return MembershipFunction(mu, name=f"tri_{a}_{b}_{c}")
+        return (x - a) * inv1 if x < b else (c - x) * inv2
+
+    def mu_vec(x: np.ndarray) -> np.ndarray:
+        return _tri(x, a, c, inv1, inv2)
+    return MembershipFunction(mu, name=f"tri_{a}_{b}_{c}", vectorized=mu_vec, knots=(a, b, c))
 
 
 def trapezoidal(a: float, b: float, c: float, d: float) -> MembershipFunction:
+    inv_ab = _inverse(b - a)
+    inv_dc = _inverse(d - c)
+
     def mu(x: float) -> float:
         if x <= a or x >= d:
             return 0.0
         if a < x < b:
-            return (x - a) / (b - a)
+            return (x - a) * inv_ab
         if b <= x <= c:
             return 1.0
-        return (d - x) / (d - c)
-    return MembershipFunction(mu, name=f"trap_{a}_{b}_{c}_{d}")
+        return (d - x) * inv_dc
+
+    def mu_vec(x: np.ndarray) -> np.ndarray:
+        return _trap(x, a, d, inv_ab, inv_dc)
+    return MembershipFunction(mu, name=f"trap_{a}_{b}_{c}_{d}", vectorized=mu_vec,
+                              knots=(a, b, c, d))
 
 # ================== examples.py ==================
 if __name__ == "__main__":
     # Universe
-    x_universe = [i for i in range(0, 101)]  # e.g., speed 0-100
+    x_universe = np.arange(0, 101, dtype=np.float64)  # e.g., speed 0-100
 
     # Define fuzzy sets: slow, medium, fast
     slow = FuzzySet(triangular(0, 0, 50), x_universe)
@@ -1,9 +1,11 @@
+import numpy as np
+
 from fuzzy import FuzzySet, FuzzyInferenceSystem, FuzzyRule, triangular, trapezoidal
 
 def thermostat_demo():
     # Universe of discourse
-    temperature_universe = [i for i in range(0, 41)]  # 0-40°C
-    power_universe = [i for i in range(-100, 101)]  # -100 (max cooling) to +100 (max heating)
+    temperature_universe = np.arange(0, 41, dtype=np.float64)  # 0-40°C
+    power_universe = np.arange(-100, 101, dtype=np.float64)  # -100 (max cooling) to +100 (max heating)
     
     # Define fuzzy sets for temperature
     cold = FuzzySet(trapezoidal(0, 0, 10, 15), temperature_universe)
@@ -24,33 +26,38 @@ def thermostat_demo():
     
     # Define rules
     # IF temperature is cold THEN power is high heating
-    fis.add_rule(FuzzyRule(lambda inp: cold.mu(inp['temperature']), high_heating))
+    fis.add_rule(FuzzyRule.from_single('temperature', cold, high_heating))
     
     # IF temperature is cool THEN power is moderate heating
-    fis.add_rule(FuzzyRule(lambda inp: cool.mu(inp['temperature']), moderate_heating))
+    fis.add_rule(FuzzyRule.from_single('temperature', cool, moderate_heating))
     
     # IF temperature is comfortable THEN power is no change
-    fis.add_rule(FuzzyRule(lambda inp: comfortable.mu(inp['temperature']), no_change))
+    fis.add_rule(FuzzyRule.from_single('temperature', comfortable, no_change))
     
     # IF temperature is warm THEN power is moderate cooling
-    fis.add_rule(FuzzyRule(lambda inp: warm.mu(inp['temperature']), moderate_cooling))
+    fis.add_rule(FuzzyRule.from_single('temperature', warm, moderate_cooling))
     
     # IF temperature is hot THEN power is high cooling
-    fis.add_rule(FuzzyRule(lambda inp: hot.mu(inp['temperature']), high_cooling))
+    fis.add_rule(FuzzyRule.from_single('temperature', hot, high_cooling))
     
-    # Test with different temperatures
+    # Test with different temperatures, all inferred in one batch
     test_temperatures = [5, 15, 23, 28, 38]
+    powers = fis.defuzzify_batch(fis.infer_batch({'temperature': test_temperatures}))
+
+    # The sparse output grid must agree with the dense one, shoulders included
+    sparse = FuzzyInferenceSystem(temperature_universe, power_universe)
+    for rule in fis.rules:
+        sparse.add_rule(rule)
+    sparse.set_sparse_output()
+    sparse_powers = sparse.defuzzify_batch(sparse.infer_batch({'temperature': test_temperatures}))
+    assert np.allclose(sparse_powers, powers, atol=0.5), (sparse_powers, powers)
     
     print("Thermostat Fuzzy Control System")
     print("==============================")
     print("Temperature (°C) | Power Output | Action")
     print("----------------|--------------|-----------------")
     
-    for temp in test_temperatures:
-        inputs = {'temperature': temp}
-        aggregated = fis.infer(inputs)
-        power = fis.defuzzify(aggregated)
-        
+    for temp, power in zip(test_temperatures, powers):
         # Determine action based on power value
         action = "No action"
         if power < -60: